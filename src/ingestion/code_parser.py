@@ -1,12 +1,60 @@
 import ast
+import multiprocessing
 import os
+import re
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from loguru import logger
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy only speeds up large files
+    np = None
 
-@dataclass
+from src.ingestion import parse_cache
+
+# In-process cache key: (filepath, st_mtime_ns, st_size)
+FileKey = Tuple[str, int, int]
+
+# Below this many uncached files, process start-up costs more than it saves
+PARALLEL_MIN_FILES = 32
+
+# Reader threads and how many files they may read ahead of the parse stage.
+# Reads release the GIL, so extra threads keep the disk queue deep.
+READ_WORKERS = 16
+READ_AHEAD = 64
+
+# Sources at least this many characters long get their newlines located with numpy
+LARGE_SOURCE_CHARS = 100_000
+
+
+class _SourceSpan:
+    """Element text kept as a span of the file's source.
+
+    Only ever held in CodeElement.content between a parse worker and the
+    parent: all elements of a file then pickle one shared copy of the source
+    instead of each carrying its own text. _materialize replaces spans with str
+    before elements leave the parser.
+    """
+    __slots__ = ('source', 'start', 'end', 'limit', 'prefix')
+
+    def __init__(self, source: str, start: int, end: int, limit: Optional[int] = None, prefix: str = ''):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.limit = limit
+        self.prefix = prefix
+
+    def __str__(self) -> str:
+        return self.prefix + self.source[self.start:self.end][:self.limit]
+
+
+@dataclass(slots=True)
 class CodeElement:
     """Represents a parsed code element."""
     type: str  # 'file', 'class', 'function'
@@ -18,138 +66,370 @@ class CodeElement:
     docstring: Optional[str] = None
     signature: Optional[str] = None
     complexity: int = 0
-    imports: List[str] = None
-
-    def __post_init__(self):
-        if self.imports is None:
-            self.imports = []
+    imports: Tuple[str, ...] = ()
 
 
 class CodeParser:
     """Parse Python code into structured elements."""
 
-    def __init__(self, max_file_size_kb: int = 500):
+    # Directories never descended into while scanning a repository (the only
+    # directory-based exclusion; the repository root itself is never filtered)
+    SKIP_DIRS = frozenset({'__pycache__', 'venv', '.venv', 'env', '.git', 'node_modules'})
+
+    # Test files, matched against the file name only
+    _TEST_NAME_RE = re.compile('test', re.IGNORECASE)
+
+    def __init__(
+            self,
+            max_file_size_kb: int = 500,
+            parse_cache_dir: Optional[str] = None,
+            file_cache_size: int = 512,
+            max_workers: Optional[int] = None
+    ):
         self.max_file_size_kb = max_file_size_kb
+        self._max_bytes = max_file_size_kb * 1024
+        # Opt-in on-disk cache of each file's elements, keyed by path and source hash.
+        # Entries are unpickled, so only point this at a directory you own.
+        self.parse_cache_dir = Path(parse_cache_dir) if parse_cache_dir else None
+        self.parse_cache_hits = 0
+        self.parse_cache_misses = 0
+        # Files whose elements are kept between calls. Size it to at least the repo's
+        # file count: a full scan of a larger repo evicts every entry before reuse.
+        self.file_cache_size = file_cache_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # (filepath, mtime_ns, size) -> parsed elements, most recently used last
+        self._file_cache: OrderedDict[FileKey, List[CodeElement]] = OrderedDict()
+        # filepath -> its current key in _file_cache
+        self._file_keys: Dict[str, FileKey] = {}
 
     def parse_repository(self, repo_path: str) -> List[CodeElement]:
         """Parse entire repository."""
-        elements = []
+        return list(self.iter_repository(repo_path))
+
+    def iter_repository(self, repo_path: str) -> Iterator[CodeElement]:
+        """Parse entire repository, yielding elements file by file as they are ready.
+
+        Uncached files fan out to worker processes; their elements arrive in
+        completion order rather than discovery order.
+        """
         repo_path = Path(repo_path)
 
         logger.info(f"Parsing repository: {repo_path}")
 
-        for py_file in repo_path.rglob("*.py"):
-            # Skip large files and test files
-            if self._should_skip_file(py_file):
-                continue
-
+        self.parse_cache_hits = 0
+        self.parse_cache_misses = 0
+        count = 0
+        files = 0
+        pending = []
+        for filepath, stat in self._walk(repo_path):
+            files += 1
+            key = self._cache_key(filepath, stat)
+            cached = self._cache_lookup(key)
+            if cached is None:
+                pending.append((filepath, key))
+            else:
+                count += len(cached)
+                yield from cached
+
+        if 0 < self.file_cache_size < files:
+            logger.info(
+                f"{files} files exceed file_cache_size={self.file_cache_size}; "
+                f"repeat scans will re-parse them"
+            )
+
+        if self.max_workers > 1 and len(pending) >= PARALLEL_MIN_FILES:
+            parsed = self._parse_parallel(pending)
+        else:
+            parsed = self._parse_serial(pending)
+
+        for key, file_elements in parsed:
+            _intern_strings(file_elements)
+            self._cache_store(key, file_elements)
+            count += len(file_elements)
+            yield from file_elements
+
+        logger.info(f"Parsed {count} code elements")
+        if self.parse_cache_dir:
+            logger.info(f"Parse cache: {self.parse_cache_hits} hits, {self.parse_cache_misses} misses")
+
+    def _walk(self, root: Path) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (filepath, stat) for Python files worth parsing under root.
+
+        Excluded directories are pruned before descending, so virtualenvs and
+        caches are never listed.
+        """
+        stack = [str(root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.py'):
+                            try:
+                                stat = entry.stat()
+                            except OSError as e:
+                                logger.warning(f"Failed to stat {entry.path}: {e}")
+                                continue
+                            if not self._should_skip_file(Path(entry.path), stat):
+                                yield entry.path, stat
+            except OSError as e:
+                logger.warning(f"Failed to scan {directory}: {e}")
+
+    def _read_sources(
+            self,
+            pending: List[Tuple[str, Optional[FileKey]]]
+    ) -> Iterator[Tuple[str, Optional[FileKey], str]]:
+        """Read pending files on a thread pool so file I/O overlaps with parsing.
+
+        Yields (filepath, key, source) in order, keeping at most READ_AHEAD
+        reads in flight. Unreadable files are logged and skipped.
+        """
+        jobs = iter(pending)
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+            in_flight = deque(
+                (filepath, key, pool.submit(_read_source, filepath))
+                for filepath, key in islice(jobs, READ_AHEAD)
+            )
+            while in_flight:
+                filepath, key, future = in_flight.popleft()
+                for next_filepath, next_key in islice(jobs, 1):
+                    in_flight.append((next_filepath, next_key, pool.submit(_read_source, next_filepath)))
+
+                try:
+                    source = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to read {filepath}: {e}")
+                    continue
+                yield filepath, key, source
+
+    def _parse_serial(
+            self,
+            pending: List[Tuple[str, Optional[FileKey]]]
+    ) -> Iterator[Tuple[Optional[FileKey], List[CodeElement]]]:
+        """Parse pending files in this process, yielding (key, elements) per file."""
+        for filepath, key, source in self._read_sources(pending):
             try:
-                file_elements = self.parse_file(str(py_file))
-                elements.extend(file_elements)
+                file_elements = self._parse_source(filepath, source)
             except Exception as e:
-                logger.warning(f"Failed to parse {py_file}: {e}")
+                logger.warning(f"Failed to parse {filepath}: {e}")
+                continue
+            yield key, file_elements
 
-        logger.info(f"Parsed {len(elements)} code elements")
-        return elements
+    def _parse_parallel(
+            self,
+            pending: List[Tuple[str, Optional[FileKey]]]
+    ) -> Iterator[Tuple[Optional[FileKey], List[CodeElement]]]:
+        """Parse pending files in a process pool, yielding (key, elements) as files complete.
+
+        Sources are read in this process by _read_sources, so workers only parse.
+        """
+        workers = min(self.max_workers, len(pending))
+        # Large chunks amortize the cost of pickling element lists between processes
+        chunksize = max(8, min(64, len(pending) // (workers * 4)))
+        parse_cache_dir = str(self.parse_cache_dir) if self.parse_cache_dir else None
+
+        with multiprocessing.Pool(
+                processes=workers,
+                initializer=_init_worker,
+                initargs=(self.max_file_size_kb, parse_cache_dir)
+        ) as pool:
+            parsed = pool.imap_unordered(_parse_in_worker, self._read_sources(pending), chunksize=chunksize)
+            for key, file_elements, hits, misses in parsed:
+                self.parse_cache_hits += hits
+                self.parse_cache_misses += misses
+                if file_elements is not None:
+                    yield key, _materialize(file_elements)
 
     def parse_file(self, filepath: str) -> List[CodeElement]:
-        """Parse single Python file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            source = f.read()
+        """Parse single Python file, reusing results for unchanged files."""
+        key = self._cache_key(filepath)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+
+        elements = _intern_strings(self._parse_file(filepath))
+        self._cache_store(key, elements)
+        return list(elements)
+
+    def _cache_key(self, filepath: str, stat: Optional[os.stat_result] = None) -> Optional[FileKey]:
+        """Build the in-process cache key for a file, or None if caching is off."""
+        if self.file_cache_size <= 0:
+            return None
+        if stat is None:
+            stat = os.stat(filepath)
+        return filepath, stat.st_mtime_ns, stat.st_size
+
+    def _cache_lookup(self, key: Optional[FileKey]) -> Optional[List[CodeElement]]:
+        """Return a copy of the cached elements for a key, or None on a miss."""
+        cached = self._file_cache.get(key) if key else None
+        if cached is None:
+            return None
+        self._file_cache.move_to_end(key)
+        return list(cached)
+
+    def _cache_store(self, key: Optional[FileKey], elements: List[CodeElement]) -> None:
+        """Remember parsed elements, replacing older entries for the same file."""
+        if not key:
+            return
+        self.invalidate(key[0])
+        self._file_cache[key] = elements
+        self._file_keys[key[0]] = key
+        if len(self._file_cache) > self.file_cache_size:
+            evicted, _ = self._file_cache.popitem(last=False)
+            del self._file_keys[evicted[0]]
+
+    def invalidate(self, filepath: str) -> None:
+        """Drop cached results for a file, e.g. on a file-watcher change event."""
+        key = self._file_keys.pop(filepath, None)
+        if key is not None:
+            del self._file_cache[key]
+
+    def clear_cache(self) -> None:
+        """Drop all cached per-file results."""
+        self._file_cache.clear()
+        self._file_keys.clear()
+
+    def _parse_file(self, filepath: str) -> List[CodeElement]:
+        """Read and parse a single Python file."""
+        return self._parse_source(filepath, _read_source(filepath))
+
+    def _parse_source(self, filepath: str, source: str) -> List[CodeElement]:
+        """Parse already-read source of a Python file."""
+        return _materialize(self._build_elements(filepath, source))
+
+    def _build_elements(self, filepath: str, source: str) -> List[CodeElement]:
+        """Parse source into elements whose class/function content is still a _SourceSpan.
+
+        With the parse cache enabled, a hit skips both parsing and the tree walk.
+        """
+        if not self.parse_cache_dir:
+            return self._extract_elements(filepath, source)
+
+        source_hash = parse_cache.hash_source(filepath, source)
+        elements = parse_cache.load(self.parse_cache_dir, source_hash)
+        if elements is not None:
+            self.parse_cache_hits += 1
+            return elements
+
+        self.parse_cache_misses += 1
+        elements = self._extract_elements(filepath, source)
+        if elements:
+            # Spans are stored unmaterialized: one copy of the source per entry
+            parse_cache.store(self.parse_cache_dir, source_hash, elements)
+        return elements
 
+    def _extract_elements(self, filepath: str, source: str) -> List[CodeElement]:
+        """Walk the parsed source and build its file, class and function elements."""
         try:
-            tree = ast.parse(source)
+            tree = _parse_ast(filepath, source)
         except SyntaxError as e:
             logger.warning(f"Syntax error in {filepath}: {e}")
             return []
 
         elements = []
+        line_starts = _line_starts(source)
 
-        # File-level element
-        file_element = self._create_file_element(filepath, source, tree)
-        elements.append(file_element)
-
-        # Class and function elements
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                class_element = self._create_class_element(filepath, source, node)
+        # One pass over every statement (expressions are never visited). Classes are
+        # found at any depth; functions only outside any def/class, methods below.
+        module_imports = []
+        nested_imports = []
+        for node, module_level in _iter_statements(tree.body):
+            if isinstance(node, ast.Import):
+                imports = module_imports if module_level else nested_imports
+                imports.extend([alias.name for alias in node.names])
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    imports = module_imports if module_level else nested_imports
+                    imports.append(node.module)
+            elif isinstance(node, ast.ClassDef):
+                class_element = self._create_class_element(filepath, source, line_starts, node)
                 elements.append(class_element)
 
                 # Methods within class
+                parent_class = class_element.name
                 for item in node.body:
                     if isinstance(item, ast.FunctionDef):
                         method_element = self._create_function_element(
-                            filepath, source, item, parent_class=node.name
+                            filepath, source, line_starts, item, parent_class=parent_class
                         )
                         elements.append(method_element)
 
-            elif isinstance(node, ast.FunctionDef):
-                # Top-level functions only
-                if self._is_top_level(node, tree):
-                    func_element = self._create_function_element(filepath, source, node)
-                    elements.append(func_element)
+            elif isinstance(node, ast.FunctionDef) and module_level:
+                func_element = self._create_function_element(filepath, source, line_starts, node)
+                elements.append(func_element)
+
+        # File-level element comes first
+        file_element = self._create_file_element(
+            filepath, source, tree, line_starts, module_imports + nested_imports
+        )
+        elements.insert(0, file_element)
 
         return elements
 
-    def _create_file_element(self, filepath: str, source: str, tree: ast.AST) -> CodeElement:
+    def _create_file_element(
+            self,
+            filepath: str,
+            source: str,
+            tree: ast.AST,
+            line_starts: List[int],
+            imports: List[str]
+    ) -> CodeElement:
         """Create file-level element."""
         # Extract module docstring
         docstring = ast.get_docstring(tree)
 
-        # Extract imports
-        imports = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                imports.extend([alias.name for alias in node.names])
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    imports.append(node.module)
-
         # Create summary (first 500 chars + docstring)
-        summary = f"# File: {Path(filepath).name}\n"
+        filename = os.path.basename(filepath)
+        summary = f"# File: {filename}\n"
         if docstring:
             summary += f'"""{docstring}"""\n\n'
-        summary += f"Imports: {', '.join(imports[:10])}\n"
+        summary += f"Imports: {', '.join(islice(imports, 10))}\n"
         summary += source[:500] + "..." if len(source) > 500 else source
 
         return CodeElement(
             type='file',
-            name=Path(filepath).name,
+            name=filename,
             content=summary,
             filepath=filepath,
             start_line=1,
-            end_line=len(source.splitlines()),
+            # A trailing newline does not start another line
+            end_line=len(line_starts) - 1 if not source or source.endswith('\n') else len(line_starts),
             docstring=docstring,
-            imports=imports
+            imports=tuple(imports)
         )
 
-    def _create_class_element(self, filepath: str, source: str, node: ast.ClassDef) -> CodeElement:
+    def _create_class_element(
+            self,
+            filepath: str,
+            source: str,
+            line_starts: List[int],
+            node: ast.ClassDef
+    ) -> CodeElement:
         """Create class-level element."""
         docstring = ast.get_docstring(node)
 
-        # Extract class signature and methods
-        methods = [item.name for item in node.body if isinstance(item, ast.FunctionDef)]
-
-        # Get source code for this class
-        lines = source.splitlines()
-        class_source = '\n'.join(lines[node.lineno - 1:node.end_lineno])
+        # Span of source code for this class
+        start, end = _line_span(source, line_starts, node.lineno, node.end_lineno)
 
         # Create summary
         signature = f"class {node.name}"
         if node.bases:
-            bases = [ast.unparse(base) for base in node.bases]
-            signature += f"({', '.join(bases)})"
+            signature += f"({', '.join(_unparse_fast(base) for base in node.bases)})"
         signature += ":"
 
         summary = f"{signature}\n"
         if docstring:
             summary += f'    """{docstring}"""\n'
-        summary += f"\n    # Methods: {', '.join(methods)}\n"
+        methods = ', '.join(item.name for item in node.body if isinstance(item, ast.FunctionDef))
+        summary += f"\n    # Methods: {methods}\n"
 
         return CodeElement(
             type='class',
             name=node.name,
-            content=class_source[:1000],  # Limit length
+            content=_SourceSpan(source, start, end, limit=1000),  # Limit length
             filepath=filepath,
             start_line=node.lineno,
             end_line=node.end_lineno,
@@ -161,6 +441,7 @@ class CodeParser:
             self,
             filepath: str,
             source: str,
+            line_starts: List[int],
             node: ast.FunctionDef,
             parent_class: Optional[str] = None
     ) -> CodeElement:
@@ -168,37 +449,40 @@ class CodeParser:
         docstring = ast.get_docstring(node)
 
         # Extract function signature
-        args = []
-        for arg in node.args.args:
-            arg_str = arg.arg
-            if arg.annotation:
-                arg_str += f": {ast.unparse(arg.annotation)}"
-            args.append(arg_str)
-
-        signature = f"def {node.name}({', '.join(args)})"
-        if node.returns:
-            signature += f" -> {ast.unparse(node.returns)}"
-        signature += ":"
-
-        # Get source code
-        lines = source.splitlines()
-        func_source = '\n'.join(lines[node.lineno - 1:node.end_lineno])
+        positional = node.args.args
+        if node.returns is None and all(arg.annotation is None for arg in positional):
+            # Common case: unannotated helper, nothing to render per argument
+            signature = f"def {node.name}({', '.join(arg.arg for arg in positional)}):"
+        else:
+            args = []
+            for arg in positional:
+                arg_str = arg.arg
+                if arg.annotation:
+                    arg_str += f": {_unparse_fast(arg.annotation)}"
+                args.append(arg_str)
+
+            signature = f"def {node.name}({', '.join(args)})"
+            if node.returns:
+                signature += f" -> {_unparse_fast(node.returns)}"
+            signature += ":"
+
+        # Span of source code
+        start, end = _line_span(source, line_starts, node.lineno, node.end_lineno)
 
         # Calculate complexity (simple metric: count control flow)
         complexity = self._calculate_complexity(node)
 
-        # Create content
-        content = f"{signature}\n"
+        # Create content: header text followed by the function's source
+        header = f"{signature}\n"
         if docstring:
-            content += f'    """{docstring}"""\n'
-        content += func_source
+            header += f'    """{docstring}"""\n'
 
         name = f"{parent_class}.{node.name}" if parent_class else node.name
 
         return CodeElement(
             type='function',
             name=name,
-            content=content,
+            content=_SourceSpan(source, start, end, prefix=header),
             filepath=filepath,
             start_line=node.lineno,
             end_line=node.end_lineno,
@@ -211,36 +495,186 @@ class CodeParser:
         """Calculate cyclomatic complexity."""
         complexity = 1  # Base complexity
 
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.ExceptHandler)):
+        # Only the function's own control flow; nested scopes are not descended into
+        stack = list(ast.iter_child_nodes(node))
+        while stack:
+            child = stack.pop()
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                continue
+            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler)):
                 complexity += 1
             elif isinstance(child, ast.BoolOp):
                 complexity += len(child.values) - 1
+            stack.extend(ast.iter_child_nodes(child))
 
         return complexity
 
-    def _is_top_level(self, node: ast.FunctionDef, tree: ast.AST) -> bool:
-        """Check if function is top-level (not nested in class)."""
-        for item in tree.body:
-            if item == node:
-                return True
-            if isinstance(item, ast.ClassDef):
-                if node in item.body:
-                    return False
-        return False
-
-    def _should_skip_file(self, filepath: Path) -> bool:
-        """Check if file should be skipped."""
-        # Skip test files
-        if 'test' in filepath.name.lower():
-            return True
-
-        # Skip __pycache__ and virtual environments
-        if any(part in str(filepath) for part in ['__pycache__', 'venv', '.venv', 'env']):
+    def _should_skip_file(self, filepath: Path, stat: Optional[os.stat_result] = None) -> bool:
+        """Check if file should be skipped (test file or too large)."""
+        if self._TEST_NAME_RE.search(filepath.name):
             return True
 
-        # Skip large files
-        if filepath.stat().st_size > self.max_file_size_kb * 1024:
-            return True
-
-        return False
\ No newline at end of file
+        return (stat or filepath.stat()).st_size > self._max_bytes
+
+
+def _materialize(elements: List[CodeElement]) -> List[CodeElement]:
+    """Replace _SourceSpan content with the text it covers."""
+    for element in elements:
+        if isinstance(element.content, _SourceSpan):
+            element.content = str(element.content)
+    return elements
+
+
+def _intern_strings(elements: List[CodeElement]) -> List[CodeElement]:
+    """Intern filepath, name and imports so repeats share one string.
+
+    Runs in the parent process: strings interned in a parse worker come back
+    through pickle as fresh copies.
+    """
+    for element in elements:
+        element.filepath = sys.intern(element.filepath)
+        element.name = sys.intern(element.name)
+        if element.imports:
+            element.imports = tuple(map(sys.intern, element.imports))
+    return elements
+
+
+def _iter_statements(body: List[ast.stmt]) -> Iterator[Tuple[ast.stmt, bool]]:
+    """Yield every statement under body in source order.
+
+    Descends into all compound statements (if/try/with/for/match, def and class
+    bodies) but never into expressions. The flag is True while the statement
+    sits outside any def or class.
+    """
+    stack = [(iter(body), True)]
+    while stack:
+        statements, module_level = stack[-1]
+        node = next(statements, None)
+        if node is None:
+            stack.pop()
+            continue
+        yield node, module_level
+
+        blocks = [getattr(node, name, None) for name in ('body', 'orelse', 'finalbody')]
+        blocks.extend(handler.body for handler in getattr(node, 'handlers', ()))
+        blocks.extend(case.body for case in getattr(node, 'cases', ()))
+        inner_level = module_level and not isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        )
+        # Pushed last-first so the first block is visited next
+        stack.extend((iter(block), inner_level) for block in reversed(blocks) if block)
+
+
+def _parse_ast(filepath: str, source: str) -> ast.Module:
+    """Parse source to an AST with compile() directly.
+
+    Type comments stay off (no PyCF_TYPE_COMMENTS) and optimize=0 keeps
+    docstrings, which ast.get_docstring needs. dont_inherit stops this module's
+    __future__ flags leaking into the parse.
+    """
+    return compile(source, filepath, 'exec', flags=ast.PyCF_ONLY_AST, dont_inherit=True, optimize=0)
+
+
+def _unparse_fast(node: ast.AST) -> str:
+    """Render an expression, skipping ast.unparse for plain names and dotted paths."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parts = []
+        current = node
+        while isinstance(current, ast.Attribute):
+            parts.append(current.attr)
+            current = current.value
+        if isinstance(current, ast.Name):
+            parts.append(current.id)
+            return '.'.join(reversed(parts))
+    elif isinstance(node, ast.Constant) and (node.value is None or type(node.value) in (str, int, bool)):
+        return repr(node.value)
+    return ast.unparse(node)
+
+
+def _line_starts(source: str) -> List[int]:
+    """Offsets in source at which each line begins."""
+    if np is not None and len(source) >= LARGE_SOURCE_CHARS:
+        # One vectorized scan; UTF-32 keeps buffer indices equal to str indices
+        if source.isascii():
+            buf = np.frombuffer(source.encode('ascii'), dtype=np.uint8)
+        else:
+            buf = np.frombuffer(source.encode('utf-32-le'), dtype='<u4')
+        newlines = np.flatnonzero(buf == 0x0A)
+        return [0] + (newlines + 1).tolist()
+
+    starts = [0]
+    newline = source.find('\n')
+    while newline != -1:
+        starts.append(newline + 1)
+        newline = source.find('\n', newline + 1)
+    return starts
+
+
+def _line_span(source: str, line_starts: List[int], first: int, last: int) -> Tuple[int, int]:
+    """Offsets of lines first..last (1-based, inclusive) without the final newline."""
+    end = line_starts[last] - 1 if last < len(line_starts) else len(source)
+    return line_starts[first - 1], end
+
+
+def _read_source(filepath: str) -> str:
+    """Read a source file as UTF-8 text with universal newlines.
+
+    Uses a single positional read sized from fstat, skipping the buffered text
+    layer that open() would stack on top.
+    """
+    if not hasattr(os, 'pread'):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        data = os.pread(fd, os.fstat(fd).st_size, 0)
+        # Pick up anything appended since the fstat
+        while True:
+            chunk = os.pread(fd, 65536, len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+
+    source = data.decode('utf-8')
+    if '\r' in source:
+        source = source.replace('\r\n', '\n').replace('\r', '\n')
+    return source
+
+
+_worker_parser: Optional[CodeParser] = None
+
+
+def _init_worker(max_file_size_kb: int, parse_cache_dir: Optional[str]) -> None:
+    """Create the per-process parser used by _parse_in_worker."""
+    global _worker_parser
+    _worker_parser = CodeParser(
+        max_file_size_kb=max_file_size_kb,
+        parse_cache_dir=parse_cache_dir,
+        file_cache_size=0,
+        max_workers=1
+    )
+
+
+def _parse_in_worker(
+        job: Tuple[str, Optional[FileKey], str]
+) -> Tuple[Optional[FileKey], Optional[List[CodeElement]], int, int]:
+    """Parse pre-read source in a worker process.
+
+    Echoes back the job's cache key with the elements (None on failure) and the
+    parse cache hits/misses incurred. Content is left as _SourceSpan so the file's
+    source crosses the process boundary once; the parent materializes it.
+    """
+    filepath, key, source = job
+    _worker_parser.parse_cache_hits = 0
+    _worker_parser.parse_cache_misses = 0
+    try:
+        elements = _worker_parser._build_elements(filepath, source)
+    except Exception as e:
+        logger.warning(f"Failed to parse {filepath}: {e}")
+        elements = None
+    return key, elements, _worker_parser.parse_cache_hits, _worker_parser.parse_cache_misses
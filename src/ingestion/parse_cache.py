@@ -0,0 +1,73 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, List, Optional
+from loguru import logger
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - falls back to stdlib blake2b
+    xxhash = None
+
+# Bump when the pickled payload, CodeElement's fields or the key scheme change
+# so stale entries are ignored.
+CACHE_FORMAT_VERSION = 3
+
+_PYTHON_TAG = f"py{sys.version_info[0]}{sys.version_info[1]}"
+
+
+def hash_source(filepath: str, source: str) -> str:
+    """Fast non-cryptographic digest of a file's path and source, used as the cache key.
+
+    The path is part of the key because cached elements record it.
+    """
+    data = f"{filepath}\0{source}".encode('utf-8', 'surrogatepass')
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _entry_path(path: Path, source_hash: str) -> Path:
+    """Location of the cache entry for a source hash."""
+    filename = f"{source_hash}-{_PYTHON_TAG}-v{CACHE_FORMAT_VERSION}.pkl"
+    return Path(path) / source_hash[:2] / filename
+
+
+def load(path: Path, source_hash: str) -> Optional[List[Any]]:
+    """Load a file's cached elements, or return None on a miss.
+
+    Entries are unpickled, which can run arbitrary code: path must be a
+    directory only the current user can write, never one inside a parsed repo.
+    """
+    entry = _entry_path(path, source_hash)
+    try:
+        with open(entry, 'rb') as f:
+            elements = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Discarding unreadable parse cache entry {entry}: {e}")
+        return None
+
+    return elements if isinstance(elements, list) else None
+
+
+def store(path: Path, source_hash: str, elements: List[Any]) -> None:
+    """Persist a file's elements for a source hash. Failures are logged, not raised."""
+    entry = _entry_path(path, source_hash)
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see partial pickles
+        fd, tmp_path = tempfile.mkstemp(dir=entry.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(elements, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.debug(f"Failed to write parse cache entry {entry}: {e}")